@@ -1,48 +1,158 @@
 from __future__ import annotations
 import os
 import sys
-import yaml
-from dotenv import load_dotenv
-from .pack_loader import load_pack
-from .placeholders import load_placeholders
-from .models import RequestParams
-from .azure_client import AzureOpenAIClient
-from .runner import run_cases
-from .report import build_report, save_report
+from typing import List, Optional
+
+# Keep module-level imports light: `plan`/`validate` run in pre-commit hooks and must
+# not pay for httpx/dotenv/the client stack. Heavy imports live in the functions using them.
+
+USAGE = "usage: llm-guardrails-audit [run|plan|validate]"
 
 def _load_yaml(path: str) -> dict:
+    import yaml
     with open(path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f) or {}
 
-def main() -> int:
+def _make_client(target_cfg: dict):
+    from .azure_client import AzureOpenAIClient
+    return AzureOpenAIClient(
+        os.environ[target_cfg["endpoint_env"]],
+        os.environ[target_cfg["api_key_env"]],
+        os.environ[target_cfg["api_version_env"]],
+        os.environ[target_cfg["deployment_env"]],
+    )
+
+def _worker_main(target_cfg: dict, queue_path: str) -> int:
+    import socket
+    from .distributed import run_worker
+    from .work_queue import SqliteWorkQueue
+
+    worker_id = os.environ.get("AUDIT_WORKER_ID", f"{socket.gethostname()}:{os.getpid()}")
+    lease_s = float(os.environ.get("AUDIT_LEASE_S", "300"))
+    # Workers may start before the coordinator; they wait this long for a run to be published.
+    wait_s = float(os.environ.get("AUDIT_WORKER_WAIT_S", "600"))
+    client = _make_client(target_cfg)
+    queue = SqliteWorkQueue(queue_path)
+    try:
+        n = run_worker(queue, client, worker_id, target=client.deployment, lease_s=lease_s, wait_s=wait_s)
+    finally:
+        queue.close()
+    print(f"Worker {worker_id}: completed {n} case(s).")
+    return 0
+
+def _plan_main(pack_path: str, placeholders_path: str, run_cfg_path: str, strict: bool) -> int:
+    from .pack_loader import load_pack
+    from .placeholders import load_placeholders
+    from .params import resolve_params
+    from .plan import plan_cases
+
+    try:
+        run_request = _load_yaml(run_cfg_path).get("request", {})
+        params = resolve_params(run_request, where=run_cfg_path)
+        cases = load_pack(pack_path, base_request=run_request)
+        has_placeholders = os.path.exists(placeholders_path)
+        placeholders = load_placeholders(placeholders_path) if has_placeholders else {}
+    except Exception as e:
+        print(f"Invalid pack/config: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+
+    p = plan_cases(cases, params, placeholders)
+
+    print("\n=== Guardrails Audit Plan ===")
+    print(f"Pack: {pack_path} ({p.total_cases} cases)")
+    print(f"Placeholders: {placeholders_path}" + ("" if has_placeholders else " (not found)"))
+    print(f"- executable: {len(p.executable)}")
+    print(f"- skipped, missing placeholders: {len(p.missing_placeholders)}")
+    print(f"- skipped, prompt too large: {len(p.oversized_skipped)}")
+    if p.oversized_warned:
+        print(f"- over max_prompt_tokens (sent anyway): {p.oversized_warned}")
+    print(f"Estimated calls: {p.estimated_calls} (up to {p.max_calls} with retries)")
+    print(f"Estimated tokens: ~{p.estimated_prompt_tokens} prompt, <= {p.max_output_tokens} output")
+    for case_id, tokens in p.missing_placeholders.items():
+        print(f"  missing in {case_id}: {tokens}")
+    print()
+
+    if strict and p.missing_placeholders:
+        return 1
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "run"
+    if command in ("-h", "--help"):
+        print(USAGE)
+        return 0
+    if command not in ("run", "plan", "validate") or len(argv) > 1:
+        print(USAGE, file=sys.stderr)
+        return 2
+
+    from dotenv import load_dotenv
     load_dotenv()
 
     # Convention over config:
+    # AUDIT_MODE=local (default) | coordinator | worker; the latter two share AUDIT_QUEUE.
+    mode = os.environ.get("AUDIT_MODE", "local")
+    queue_path = os.environ.get("AUDIT_QUEUE", "reports/queue.sqlite")
     pack_path = os.environ.get("AUDIT_PACK", "packs/core_pack.yaml")
     placeholders_path = os.environ.get("AUDIT_PLACEHOLDERS", "packs/placeholders.local.yaml")
     target_cfg_path = os.environ.get("AUDIT_TARGET", "configs/target.example.yaml")
     run_cfg_path = os.environ.get("AUDIT_RUNCFG", "configs/run.defaults.yaml")
     out_path = os.environ.get("AUDIT_OUT", "reports/report.json")
 
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    if command != "run":
+        # Network-free: no target config, env credentials or client needed.
+        return _plan_main(pack_path, placeholders_path, run_cfg_path, strict=(command == "validate"))
+
+    if mode not in ("local", "coordinator", "worker"):
+        print(f"Unknown AUDIT_MODE={mode!r} (expected local, coordinator or worker)", file=sys.stderr)
+        return 2
 
     target_cfg = _load_yaml(target_cfg_path)
+    if mode == "worker":
+        return _worker_main(target_cfg, queue_path)
+
+    from .pack_loader import load_pack
+    from .placeholders import load_placeholders
+    from .params import resolve_params
+    from .runner import run_cases
+    from .report import build_report, save_report
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
     run_cfg = _load_yaml(run_cfg_path)
 
-    params = RequestParams(**run_cfg.get("request", {}))
+    run_request = run_cfg.get("request", {})
+    params = resolve_params(run_request, where=run_cfg_path)
     store_hashes = bool(run_cfg.get("logging", {}).get("store_output_hash", True))
 
+    # The coordinator never calls the model, so it does not need the API key.
     endpoint = os.environ[target_cfg["endpoint_env"]]
-    api_key = os.environ[target_cfg["api_key_env"]]
     api_version = os.environ[target_cfg["api_version_env"]]
     deployment = os.environ[target_cfg["deployment_env"]]
 
-    client = AzureOpenAIClient(endpoint, api_key, api_version, deployment)
-
-    cases = load_pack(pack_path)
+    cases = load_pack(pack_path, base_request=run_request)
     placeholders = load_placeholders(placeholders_path) if os.path.exists(placeholders_path) else {}
 
-    results = run_cases(client, cases, params, placeholders)
+    if mode == "coordinator":
+        import uuid
+        from .distributed import enqueue_cases, wait_for_results, merge_results
+        from .work_queue import SqliteWorkQueue
+
+        timeout_s = float(os.environ.get("AUDIT_QUEUE_TIMEOUT", "3600"))
+        run_id = uuid.uuid4().hex
+        queue = SqliteWorkQueue(queue_path)
+        try:
+            items, local = enqueue_cases(queue, cases, params, placeholders, target=deployment, run_id=run_id)
+            print(f"Enqueued {len(items)} case(s) on {queue_path} (run {run_id}); waiting for workers...")
+            try:
+                remote = wait_for_results(queue, timeout_s=timeout_s)
+            finally:
+                # Closed runs are not leased any more; idle workers exit.
+                queue.close_run(run_id)
+        finally:
+            queue.close()
+        results = merge_results(cases, params, local, remote)
+    else:
+        results = run_cases(_make_client(target_cfg), cases, params, placeholders)
 
     target = {
         "provider": target_cfg.get("provider", "azure_openai"),
@@ -65,6 +175,7 @@ def main() -> int:
             f"evidence={item['evidence']}"
         )
     print(f"\nSaved report: {out_path}\n")
+    return 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+from __future__ import annotations
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+from .models import Case, RequestParams, CaseResult, ObservedResponse, FilterSignals
+from .params import resolve_params, params_fingerprint
+from .report import sha256_text
+from .runner import render_case, execute_prompt, finalize_case, not_executed_result
+from .work_queue import WorkItem, WorkQueue
+
+# Set on a worker result when the case was not sent to the model; value is the evidence code.
+NOT_EXECUTED_KEY = "not_executed"
+
+def observed_to_dict(o: ObservedResponse) -> Dict[str, Any]:
+    """
+    Compact wire form of an observation: no content, headers or raw payload.
+    The content is replaced by its hash; filter signals are kept as-is.
+    """
+    return {
+        "http_status": o.http_status,
+        "finish_reason": o.finish_reason,
+        "error": o.error,
+        "filter_signals": asdict(o.filter_signals),
+        "model_refused": o.model_refused,
+        "content_hash": sha256_text(o.content) if o.content is not None else o.content_hash,
+    }
+
+def observed_from_dict(d: Dict[str, Any]) -> ObservedResponse:
+    return ObservedResponse(
+        http_status=d["http_status"],
+        content=None,
+        finish_reason=d.get("finish_reason"),
+        error=d.get("error"),
+        filter_signals=FilterSignals(**(d.get("filter_signals") or {})),
+        headers=None,
+        raw_json=None,
+        model_refused=bool(d.get("model_refused")),
+        content_hash=d.get("content_hash"),
+    )
+
+# --- Coordinator ---
+
+def enqueue_cases(
+    queue: WorkQueue,
+    cases: List[Case],
+    params: RequestParams,
+    placeholders: Dict[str, str],
+    target: str,
+    run_id: str,
+) -> Tuple[List[WorkItem], Dict[str, CaseResult]]:
+    """
+    Render cases and publish the executable ones as run `run_id`
+    (replacing whatever run the queue held before).
+    Returns (enqueued items, results for cases resolved locally without a call).
+    """
+    items: List[WorkItem] = []
+    local: Dict[str, CaseResult] = {}
+    for c in cases:
+        prompt, case_params, skipped = render_case(c, params, placeholders)
+        if skipped is not None:
+            local[c.case_id] = skipped
+            continue
+        items.append(WorkItem(
+            case_id=c.case_id,
+            target=target,
+            prompt=prompt,
+            params=asdict(case_params),
+            params_fp=params_fingerprint(case_params),
+        ))
+    queue.enqueue(run_id, items)
+    return items, local
+
+def wait_for_results(queue: WorkQueue, poll_s: float = 2.0, timeout_s: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+    deadline = None if timeout_s is None else time.monotonic() + timeout_s
+    while queue.pending() > 0:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        time.sleep(poll_s)
+    return queue.results()
+
+def merge_results(
+    cases: List[Case],
+    params: RequestParams,
+    local: Dict[str, CaseResult],
+    remote: Dict[str, Dict[str, Any]],
+) -> List[CaseResult]:
+    """
+    Rebuild CaseResults in pack order; classification is done here, not on workers.
+    Cases with no worker result (timeout) or rejected by the worker are reported as not executed.
+    """
+    results: List[CaseResult] = []
+    for c in cases:
+        if c.case_id in local:
+            results.append(local[c.case_id])
+            continue
+        case_params = c.params or params
+        if c.case_id not in remote:
+            results.append(not_executed_result(
+                c, case_params,
+                error="No worker result (coordinator timeout or case abandoned after repeated lease expiry)",
+                evidence_code="TEST_NOT_EXECUTED_NO_WORKER_RESULT",
+                reason="No worker completed this case; case not executed.",
+            ))
+            continue
+        res = remote[c.case_id]
+        if res.get(NOT_EXECUTED_KEY):
+            # Worker refused to send it: never let it classify as OFF.
+            results.append(not_executed_result(
+                c, case_params,
+                error=res.get("error") or "Rejected by worker",
+                evidence_code=res[NOT_EXECUTED_KEY],
+                reason="Worker rejected the case; case not executed.",
+            ))
+            continue
+        results.append(finalize_case(c, case_params, observed_from_dict(res)))
+    return results
+
+# --- Worker ---
+
+def _rejected(error: str) -> Dict[str, Any]:
+    return {NOT_EXECUTED_KEY: "TEST_NOT_EXECUTED_WORKER_REJECTED", "error": error}
+
+def _execute_item(client, it: WorkItem, worker_id: str) -> Dict[str, Any]:
+    # Coordinator/worker version skew shows up as unknown keys or a different fingerprint;
+    # report it on the case instead of crashing (and re-crashing) workers.
+    try:
+        params = resolve_params(it.params, where=f"queue:{it.case_id}")
+    except ValueError as e:
+        return _rejected(f"Invalid params on worker {worker_id}: {e}; case not executed.")
+    if params_fingerprint(params) != it.params_fp:
+        return _rejected(f"Params fingerprint mismatch on worker {worker_id}; case not executed.")
+    return observed_to_dict(execute_prompt(client, it.prompt, params))
+
+def wait_for_run(queue: WorkQueue, poll_s: float = 2.0, timeout_s: Optional[float] = None) -> Optional[str]:
+    """Block until a coordinator has published an open run; returns its run_id or None on timeout."""
+    deadline = None if timeout_s is None else time.monotonic() + timeout_s
+    while True:
+        run_id = queue.open_run()
+        if run_id is not None:
+            return run_id
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        time.sleep(poll_s)
+
+def run_worker(
+    queue: WorkQueue,
+    client,
+    worker_id: str,
+    target: Optional[str] = None,
+    batch: int = 1,
+    lease_s: float = 300.0,
+    poll_s: float = 2.0,
+    wait_s: Optional[float] = None,
+) -> int:
+    """
+    Wait (up to wait_s) for a published run, then lease and execute its items
+    until nothing is pending or the coordinator closes the run. Keeps polling
+    while other workers hold leases so expired ones get picked up.
+    Returns the number of results this worker stored.
+    """
+    run_id = wait_for_run(queue, poll_s=poll_s, timeout_s=wait_s)
+    if run_id is None:
+        return 0
+
+    done = 0
+    while queue.open_run() == run_id:
+        items = queue.lease(worker_id, target=target, n=batch, lease_s=lease_s)
+        if not items:
+            if queue.pending() == 0:
+                break
+            time.sleep(poll_s)
+            continue
+
+        for it in items:
+            result = _execute_item(client, it, worker_id)
+            if queue.complete(it.run_id, it.case_id, worker_id, result):
+                done += 1
+    return done
@@ -14,9 +14,25 @@ Risk = Literal[
 
 Channel = Literal["input", "output"]
 
+OversizedPromptPolicy = Literal["warn", "skip"]
+
 GuardrailStatus = Literal["ON_BLOCKING", "ON_ANNOTATE_ONLY", "OFF", "INCONCLUSIVE"]
 BlockLayer = Literal["platform", "content_filter", "model", "none", "inconclusive"]
 
+@dataclass(frozen=True)
+class RequestParams:
+    temperature: float = 0.0
+    top_p: float = 1.0
+    max_output_tokens: int = 200
+    timeout_s: int = 30
+    retries: int = 2
+    retry_backoff_s: float = 1.5
+
+    # Local prompt-size guard (estimated tokens, see params.estimate_prompt_tokens).
+    # None disables the check; "warn" still sends the request, "skip" does not.
+    max_prompt_tokens: Optional[int] = None
+    oversized_prompt: OversizedPromptPolicy = "warn"
+
 @dataclass(frozen=True)
 class Case:
     case_id: str
@@ -26,14 +42,9 @@ class Case:
     prompt: str
     goal: Optional[str] = None  # optional human explanation
 
-@dataclass
-class RequestParams:
-    temperature: float = 0.0
-    top_p: float = 1.0
-    max_output_tokens: int = 200
-    timeout_s: int = 30
-    retries: int = 2
-    retry_backoff_s: float = 1.5
+    # Resolved per-case request params (run config -> pack -> channel -> case).
+    # None means "use the run-level params passed to the runner".
+    params: Optional[RequestParams] = None
 
 @dataclass
 class FilterSignals:
@@ -66,6 +77,9 @@ class ObservedResponse:
     # Derived at runtime; you can avoid storing full content by storing only this boolean.
     model_refused: bool = False
 
+    # Set when content was dropped before reaching the report (e.g. distributed workers).
+    content_hash: Optional[str] = None
+
 @dataclass
 class CaseClassification:
     guardrail_status: GuardrailStatus
@@ -1,22 +1,53 @@
 from __future__ import annotations
-import yaml
-from typing import List
-from .models import Case
+from typing import Any, Dict, List, Mapping, Optional, get_args
+from .models import Case, Channel
+from .params import check_request_layer, resolve_params
 
-def load_pack(path: str) -> List[Case]:
+def load_pack(path: str, base_request: Optional[Mapping[str, Any]] = None) -> List[Case]:
+    """
+    Load a pack and resolve request params per case, in layers:
+      base_request (run config) -> defaults.request -> defaults.channels.<channel>.request -> case.request
+    """
+    import yaml  # lazy: keeps `import llm_guardrails_audit.cli` cheap
     with open(path, "r", encoding="utf-8") as f:
         data = yaml.safe_load(f) or {}
 
+    channels = get_args(Channel)
+    base_request = check_request_layer(base_request or {}, "run config request")
+
+    defaults = data.get("defaults") or {}
+    pack_request = check_request_layer(defaults.get("request") or {}, f"{path}: defaults.request")
+    channel_defaults: Dict[str, Any] = defaults.get("channels") or {}
+    unknown_channels = set(channel_defaults) - set(channels)
+    if unknown_channels:
+        raise ValueError(f"{path}: unknown channels under defaults.channels {sorted(unknown_channels)}")
+    channel_requests = {
+        ch: check_request_layer((cfg or {}).get("request") or {}, f"{path}: defaults.channels.{ch}.request")
+        for ch, cfg in channel_defaults.items()
+    }
+
     cases = []
     for item in data.get("cases", []):
+        case_id = item["case_id"]
+        channel = item["channel"]
+        if channel not in channels:
+            raise ValueError(f"{path}: cases[{case_id}]: unknown channel {channel!r} (expected one of {list(channels)})")
+        params = resolve_params(
+            base_request,
+            pack_request,
+            channel_requests.get(channel),
+            check_request_layer(item.get("request") or {}, f"{path}: cases[{case_id}].request"),
+            where=f"{path}: cases[{case_id}]",
+        )
         cases.append(
             Case(
-                case_id=item["case_id"],
+                case_id=case_id,
                 risk=item["risk"],
-                channel=item["channel"],
+                channel=channel,
                 language=item.get("language", "en"),
                 prompt=item["prompt"],
                 goal=item.get("goal"),
+                params=params,
             )
         )
     return cases
@@ -0,0 +1,109 @@
+from __future__ import annotations
+import hashlib
+import json
+import math
+import re
+from dataclasses import asdict, fields, replace
+from typing import Any, Dict, Mapping, Optional, get_args
+from .models import RequestParams, OversizedPromptPolicy
+
+PARAM_KEYS = frozenset(f.name for f in fields(RequestParams))
+
+_NUMERIC_PARAMS = {
+    "temperature": float,
+    "top_p": float,
+    "max_output_tokens": int,
+    "timeout_s": int,
+    "retries": int,
+    "retry_backoff_s": float,
+    "max_prompt_tokens": int,  # also accepts None (check disabled)
+}
+
+# (low, low_inclusive, high) with high inclusive; None = unbounded.
+# temperature/top_p follow the Chat Completions API limits.
+_PARAM_RANGES = {
+    "temperature": (0.0, True, 2.0),
+    "top_p": (0.0, True, 1.0),
+    "max_output_tokens": (1, True, None),
+    "timeout_s": (0, False, None),
+    "retries": (0, True, None),
+    "retry_backoff_s": (0.0, True, None),
+    "max_prompt_tokens": (1, True, None),
+}
+
+# Rough tokenizer stand-in: words and individual punctuation marks.
+_PIECE_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+def estimate_prompt_tokens(text: str | None) -> int:
+    """
+    Cheap, local upper-ish estimate of prompt tokens (no tokenizer dependency).
+    Takes the larger of ~4 chars/token and the word/punctuation piece count.
+    """
+    if not text:
+        return 0
+    by_chars = math.ceil(len(text) / 4)
+    by_pieces = len(_PIECE_RE.findall(text))
+    return max(by_chars, by_pieces)
+
+def check_request_layer(layer: Mapping[str, Any], where: str) -> Dict[str, Any]:
+    """
+    Validate one layer of request params (keys, types, ranges) and return it
+    with numbers coerced. `where` labels errors, e.g. "pack.yaml: defaults.request".
+    """
+    if not isinstance(layer, Mapping):
+        raise ValueError(f"{where}: request params must be a mapping, got {type(layer).__name__}")
+    unknown = set(layer) - PARAM_KEYS
+    if unknown:
+        raise ValueError(f"{where}: unknown request params {sorted(unknown)}")
+
+    out = dict(layer)
+    for key, value in out.items():
+        if key == "oversized_prompt":
+            if value not in get_args(OversizedPromptPolicy):
+                raise ValueError(f"{where}: oversized_prompt must be one of {list(get_args(OversizedPromptPolicy))}, got {value!r}")
+        elif key == "max_prompt_tokens" and value is None:
+            continue
+        else:
+            out[key] = _coerce_number(key, value, _NUMERIC_PARAMS[key], where)
+            _check_range(key, out[key], where)
+    return out
+
+def _check_range(key: str, value: Any, where: str) -> None:
+    low, low_inclusive, high = _PARAM_RANGES[key]
+    ok = (value >= low if low_inclusive else value > low) and (high is None or value <= high)
+    if not ok:
+        bound = f"{'>=' if low_inclusive else '>'} {low}" + ("" if high is None else f" and <= {high}")
+        raise ValueError(f"{where}: {key} must be {bound}, got {value!r}")
+
+def _coerce_number(key: str, value: Any, kind: type, where: str) -> Any:
+    # bool is an int subclass; `retries: true` is a typo, not 1.
+    if not isinstance(value, bool):
+        try:
+            num = float(value)
+        except (TypeError, ValueError):
+            num = None
+        if num is not None and math.isfinite(num) and (kind is float or num.is_integer()):
+            return kind(num)
+    raise ValueError(f"{where}: {key} must be {'an integer' if kind is int else 'a number'}, got {value!r}")
+
+def resolve_params(*layers: Optional[Mapping[str, Any]], where: str = "request") -> RequestParams:
+    """
+    Merge request param layers left to right (later layers win) on top of the
+    RequestParams defaults. None/empty layers are skipped.
+
+    Typical order: run config -> pack defaults -> channel defaults -> case overrides.
+    """
+    merged: Dict[str, Any] = {}
+    for i, layer in enumerate(layers):
+        if not layer:
+            continue
+        merged.update(check_request_layer(layer, f"{where}[{i}]"))
+    return replace(RequestParams(), **merged)
+
+def params_fingerprint(params: RequestParams) -> str:
+    """
+    Short stable hash of the resolved params; lets distributed workers detect
+    version skew between the params they rebuilt and what the coordinator sent.
+    """
+    blob = json.dumps(asdict(params), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
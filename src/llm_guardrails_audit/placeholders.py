@@ -1,11 +1,11 @@
 from __future__ import annotations
 import re
-import yaml
 from typing import Dict
 
 TOKEN_RE = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
 
 def load_placeholders(path: str) -> Dict[str, str]:
+    import yaml  # lazy, see cli
     with open(path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f) or {}
 
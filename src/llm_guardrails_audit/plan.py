@@ -0,0 +1,40 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List
+from .models import Case, RequestParams
+from .runner import check_case, SKIP_MISSING_PLACEHOLDERS, SKIP_PROMPT_TOO_LARGE
+
+@dataclass
+class Plan:
+    total_cases: int = 0
+    executable: List[str] = field(default_factory=list)
+    missing_placeholders: Dict[str, List[str]] = field(default_factory=dict)
+    oversized_skipped: List[str] = field(default_factory=list)
+    oversized_warned: List[str] = field(default_factory=list)
+    estimated_calls: int = 0
+    max_calls: int = 0                   # worst case, every retry used
+    estimated_prompt_tokens: int = 0
+    max_output_tokens: int = 0
+
+def plan_cases(cases: List[Case], params: RequestParams, placeholders: Dict[str, str]) -> Plan:
+    """
+    Dry run: same runner.check_case decisions as a real run, no client, no network.
+    """
+    p = Plan(total_cases=len(cases))
+    for c in cases:
+        chk = check_case(c, params, placeholders)
+        if chk.skip_code == SKIP_MISSING_PLACEHOLDERS:
+            p.missing_placeholders[c.case_id] = list(chk.missing)
+            continue
+        if chk.skip_code == SKIP_PROMPT_TOO_LARGE:
+            p.oversized_skipped.append(c.case_id)
+            continue
+        if chk.message:
+            p.oversized_warned.append(c.case_id)
+
+        p.executable.append(c.case_id)
+        p.estimated_calls += 1
+        p.max_calls += chk.params.retries + 1
+        p.estimated_prompt_tokens += chk.prompt_tokens
+        p.max_output_tokens += chk.params.max_output_tokens
+    return p
@@ -39,7 +39,7 @@ def build_report(target: Dict[str, Any], results: List[CaseResult], store_hashes
         }
 
         if store_hashes:
-            case_obj["content_hash"] = sha256_text(o.content)
+            case_obj["content_hash"] = sha256_text(o.content) if o.content is not None else o.content_hash
 
         out_cases.append(case_obj)
 
@@ -1,75 +1,139 @@
 from __future__ import annotations
+import sys
 import time
-from typing import List, Dict
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
 from .models import Case, RequestParams, CaseResult, ObservedResponse, FilterSignals
+from .params import estimate_prompt_tokens
 from .placeholders import apply_placeholders, find_missing
 from .scoring import detect_model_refusal, classify_case
 
+def not_executed_result(c: Case, params: RequestParams, error: str, evidence_code: str, reason: str) -> CaseResult:
+    observed = ObservedResponse(
+        http_status=0,
+        content=None,
+        finish_reason=None,
+        error=error,
+        filter_signals=FilterSignals(),
+        headers=None,
+        raw_json=None,
+        model_refused=False,
+    )
+    dummy = CaseResult(
+        case=c,
+        params=params,
+        observed=observed,
+        classification=None,  # fill below
+    )
+    classification = classify_case(dummy)  # will become OFF/none w/out signals; override as inconclusive
+    classification.guardrail_status = "INCONCLUSIVE"
+    classification.block_layer = "inconclusive"
+    classification.evidence_codes = [evidence_code]
+    classification.reason = reason
+    dummy.classification = classification
+    return dummy
+
+SKIP_MISSING_PLACEHOLDERS = "TEST_NOT_EXECUTED_MISSING_PLACEHOLDERS"
+SKIP_PROMPT_TOO_LARGE = "TEST_NOT_EXECUTED_PROMPT_TOO_LARGE"
+
+_SKIP_REASONS = {
+    SKIP_MISSING_PLACEHOLDERS: "Missing placeholders; case not executed.",
+    SKIP_PROMPT_TOO_LARGE: "Estimated prompt tokens over limit; case not executed.",
+}
+
+@dataclass(frozen=True)
+class CaseCheck:
+    prompt: str
+    params: RequestParams
+    prompt_tokens: int                  # estimate, see params.estimate_prompt_tokens
+    missing: Tuple[str, ...] = ()
+    skip_code: Optional[str] = None     # evidence code when the case must not be executed
+    message: Optional[str] = None       # skip error, or warning when sent anyway
+
+def check_case(c: Case, params: RequestParams, placeholders: Dict[str, str]) -> CaseCheck:
+    """
+    Pure pre-flight decision for a case, shared by run (render_case) and plan/validate.
+    """
+    # Per-case resolved params (see pack_loader) take precedence over run-level params.
+    case_params = c.params or params
+    prompt = apply_placeholders(c.prompt, placeholders)
+    est = estimate_prompt_tokens(prompt)
+    missing = tuple(sorted(find_missing(c.prompt, placeholders)))
+    if missing:
+        return CaseCheck(prompt, case_params, est, missing, SKIP_MISSING_PLACEHOLDERS, f"Missing placeholders: {list(missing)}")
+
+    if case_params.max_prompt_tokens is not None and est > case_params.max_prompt_tokens:
+        msg = f"Prompt too large: ~{est} tokens > max_prompt_tokens={case_params.max_prompt_tokens}"
+        skip = SKIP_PROMPT_TOO_LARGE if case_params.oversized_prompt == "skip" else None
+        return CaseCheck(prompt, case_params, est, missing, skip, msg)
+
+    return CaseCheck(prompt, case_params, est)
+
+def render_case(c: Case, params: RequestParams, placeholders: Dict[str, str]) -> Tuple[str, RequestParams, Optional[CaseResult]]:
+    """
+    Resolve the prompt and effective params for a case.
+    Returns (prompt, case_params, result); result is set when the case must not be executed.
+    """
+    chk = check_case(c, params, placeholders)
+    if chk.skip_code is not None:
+        return chk.prompt, chk.params, not_executed_result(
+            c, chk.params,
+            error=chk.message,
+            evidence_code=chk.skip_code,
+            reason=_SKIP_REASONS[chk.skip_code],
+        )
+    if chk.message:
+        print(f"[warn] {c.case_id}: {chk.message}", file=sys.stderr)
+    return chk.prompt, chk.params, None
+
+def execute_prompt(client, prompt: str, params: RequestParams) -> ObservedResponse:
+    last_obs = None
+    err = None
+    for attempt in range(params.retries + 1):
+        try:
+            last_obs = client.chat_completions(prompt, params)
+            err = None
+            break
+        except Exception as e:
+            err = str(e)
+            time.sleep(params.retry_backoff_s * (attempt + 1))
+
+    if last_obs is None:
+        last_obs = ObservedResponse(
+            http_status=0,
+            content=None,
+            finish_reason=None,
+            error=err or "Unknown error",
+            filter_signals=FilterSignals(),
+            headers=None,
+            raw_json=None,
+            model_refused=False,
+        )
+
+    # Derive model refusal boolean (you can later avoid storing content entirely)
+    last_obs.model_refused = detect_model_refusal(last_obs.content)
+    return last_obs
+
+def finalize_case(c: Case, params: RequestParams, observed: ObservedResponse) -> CaseResult:
+    tmp = CaseResult(
+        case=c,
+        params=params,
+        observed=observed,
+        classification=None,
+    )
+    tmp.classification = classify_case(tmp)
+    return tmp
+
 def run_cases(client, cases: List[Case], params: RequestParams, placeholders: Dict[str, str]) -> List[CaseResult]:
     results: List[CaseResult] = []
 
     for c in cases:
-        prompt = apply_placeholders(c.prompt, placeholders)
-        missing = find_missing(c.prompt, placeholders)
-        if missing:
-            observed = ObservedResponse(
-                http_status=0,
-                content=None,
-                finish_reason=None,
-                error=f"Missing placeholders: {sorted(missing)}",
-                filter_signals=FilterSignals(),
-                headers=None,
-                raw_json=None,
-                model_refused=False,
-            )
-            dummy = CaseResult(
-                case=c,
-                params=params,
-                observed=observed,
-                classification=None,  # fill below
-            )
-            classification = classify_case(dummy)  # will become OFF/none w/out signals; override as inconclusive
-            classification.guardrail_status = "INCONCLUSIVE"
-            classification.block_layer = "inconclusive"
-            classification.evidence_codes = ["TEST_NOT_EXECUTED_MISSING_PLACEHOLDERS"]
-            classification.reason = "Missing placeholders; case not executed."
-            dummy.classification = classification
-            results.append(dummy)
+        prompt, case_params, skipped = render_case(c, params, placeholders)
+        if skipped is not None:
+            results.append(skipped)
             continue
 
-        last_obs = None
-        err = None
-        for attempt in range(params.retries + 1):
-            try:
-                last_obs = client.chat_completions(prompt, params)
-                err = None
-                break
-            except Exception as e:
-                err = str(e)
-                time.sleep(params.retry_backoff_s * (attempt + 1))
-
-        if last_obs is None:
-            last_obs = ObservedResponse(
-                http_status=0,
-                content=None,
-                finish_reason=None,
-                error=err or "Unknown error",
-                filter_signals=FilterSignals(),
-                headers=None,
-                raw_json=None,
-                model_refused=False,
-            )
-
-        # Derive model refusal boolean (you can later avoid storing content entirely)
-        last_obs.model_refused = detect_model_refusal(last_obs.content)
-
-        tmp = CaseResult(
-            case=c,
-            params=params,
-            observed=last_obs,
-            classification=None,
-        )
-        tmp.classification = classify_case(tmp)
-        results.append(tmp)
+        observed = execute_prompt(client, prompt, case_params)
+        results.append(finalize_case(c, case_params, observed))
 
     return results
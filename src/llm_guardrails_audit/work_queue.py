@@ -0,0 +1,200 @@
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Protocol
+
+@dataclass(frozen=True)
+class WorkItem:
+    case_id: str
+    target: str          # logical target (deployment name); workers only lease matching items
+    prompt: str          # rendered prompt (placeholders applied)
+    params: Dict[str, Any]
+    params_fp: str
+    attempts: int = 0
+    run_id: str = ""     # set by the queue on lease
+
+class WorkQueue(Protocol):
+    """
+    Minimal lease-based queue contract used by the coordinator and workers.
+    A queue holds one run at a time: the coordinator publishes it with enqueue()
+    and ends it with close_run(); workers only lease from the open run.
+    Backends only need these methods; see SqliteWorkQueue for the local one.
+    """
+    def enqueue(self, run_id: str, items: List[WorkItem]) -> None: ...
+    def close_run(self, run_id: str) -> None: ...
+    def open_run(self) -> Optional[str]: ...
+    def lease(self, worker_id: str, target: Optional[str] = None, n: int = 1, lease_s: float = 300.0) -> List[WorkItem]: ...
+    def complete(self, run_id: str, case_id: str, worker_id: str, result: Dict[str, Any]) -> bool: ...
+    def pending(self) -> int: ...
+    def results(self) -> Dict[str, Dict[str, Any]]: ...
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS work_items (
+        run_id        TEXT NOT NULL,
+        case_id       TEXT NOT NULL,
+        target        TEXT NOT NULL,
+        prompt        TEXT NOT NULL,
+        params_json   TEXT NOT NULL,
+        params_fp     TEXT NOT NULL,
+        status        TEXT NOT NULL DEFAULT 'queued',  -- queued | leased | done | failed
+        worker_id     TEXT,
+        lease_expires REAL,
+        attempts      INTEGER NOT NULL DEFAULT 0,
+        result_json   TEXT,
+        PRIMARY KEY (run_id, case_id)
+    )
+    """,
+    # Single row: the current run and whether workers may still lease from it.
+    """
+    CREATE TABLE IF NOT EXISTS run_meta (
+        id     INTEGER PRIMARY KEY CHECK (id = 1),
+        run_id TEXT NOT NULL,
+        state  TEXT NOT NULL  -- open | closed
+    )
+    """,
+)
+
+_CURRENT_RUN = "(SELECT run_id FROM run_meta WHERE id = 1)"
+
+class SqliteWorkQueue:
+    """
+    File-backed queue on SQLite. Safe for several processes on one host or a
+    shared filesystem with working locks. Expired leases are handed out again,
+    up to max_attempts leases per case; after that the case is marked failed.
+
+    Note: rendered prompts (with canaries) are stored in the file; keep it out of git.
+    """
+    def __init__(self, path: str, timeout_s: float = 30.0, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        # Workers may start first on a fresh checkout (no reports/ yet).
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # isolation_level=None: we manage transactions explicitly (BEGIN IMMEDIATE).
+        self._conn = sqlite3.connect(path, timeout=timeout_s, isolation_level=None)
+        with self._tx():
+            # Queue files are transient: recreate them on a layout change.
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS work_items")
+                self._conn.execute("DROP TABLE IF EXISTS run_meta")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def enqueue(self, run_id: str, items: List[WorkItem]) -> None:
+        """
+        Publish a new run. Rows from any previous run are dropped in the same
+        transaction, so stale prompts are never leased or reported.
+        """
+        with self._tx():
+            self._conn.execute("DELETE FROM work_items")
+            self._conn.executemany(
+                "INSERT INTO work_items (run_id, case_id, target, prompt, params_json, params_fp) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, it.case_id, it.target, it.prompt, json.dumps(it.params, sort_keys=True), it.params_fp) for it in items],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO run_meta (id, run_id, state) VALUES (1, ?, 'open')",
+                (run_id,),
+            )
+
+    def close_run(self, run_id: str) -> None:
+        with self._tx():
+            self._conn.execute("UPDATE run_meta SET state = 'closed' WHERE id = 1 AND run_id = ?", (run_id,))
+
+    def open_run(self) -> Optional[str]:
+        row = self._conn.execute("SELECT run_id FROM run_meta WHERE id = 1 AND state = 'open'").fetchone()
+        return row[0] if row else None
+
+    def lease(self, worker_id: str, target: Optional[str] = None, n: int = 1, lease_s: float = 300.0) -> List[WorkItem]:
+        now = time.time()
+        with self._tx():
+            run_id = self.open_run()
+            if run_id is None:
+                return []
+
+            # Give up on cases whose leases keep expiring (e.g. they crash every worker).
+            self._conn.execute(
+                "UPDATE work_items SET status = 'failed', lease_expires = NULL "
+                "WHERE run_id = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (run_id, now, self.max_attempts),
+            )
+
+            sql = (
+                "SELECT case_id, target, prompt, params_json, params_fp, attempts FROM work_items "
+                "WHERE run_id = ? AND (status = 'queued' OR (status = 'leased' AND lease_expires < ?))"
+            )
+            args: List[Any] = [run_id, now]
+            if target is not None:
+                sql += " AND target = ?"
+                args.append(target)
+            sql += " ORDER BY attempts, case_id LIMIT ?"
+            args.append(n)
+
+            rows = self._conn.execute(sql, args).fetchall()
+            self._conn.executemany(
+                "UPDATE work_items SET status = 'leased', worker_id = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE run_id = ? AND case_id = ?",
+                [(worker_id, now + lease_s, run_id, r[0]) for r in rows],
+            )
+
+        return [
+            WorkItem(
+                case_id=r[0], target=r[1], prompt=r[2], params=json.loads(r[3]), params_fp=r[4],
+                attempts=r[5] + 1, run_id=run_id,
+            )
+            for r in rows
+        ]
+
+    def complete(self, run_id: str, case_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """
+        Store a result. First result wins: a worker whose lease expired may still
+        complete the case if nobody else has yet, even one already marked failed.
+        Returns False if already done or if the run has been replaced.
+        """
+        with self._tx():
+            cur = self._conn.execute(
+                "UPDATE work_items SET status = 'done', worker_id = ?, lease_expires = NULL, result_json = ? "
+                "WHERE run_id = ? AND case_id = ? AND status != 'done'",
+                (worker_id, json.dumps(result), run_id, case_id),
+            )
+        return cur.rowcount == 1
+
+    def pending(self) -> int:
+        """Cases of the current run still waiting for a result."""
+        now = time.time()
+        return self._conn.execute(
+            f"SELECT COUNT(*) FROM work_items WHERE run_id = {_CURRENT_RUN} "
+            "AND (status = 'queued' OR (status = 'leased' AND NOT (lease_expires < ? AND attempts >= ?)))",
+            (now, self.max_attempts),
+        ).fetchone()[0]
+
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        rows = self._conn.execute(
+            f"SELECT case_id, result_json FROM work_items WHERE run_id = {_CURRENT_RUN} AND status = 'done'"
+        ).fetchall()
+        return {case_id: json.loads(blob) for case_id, blob in rows}
+
+    def _tx(self):
+        return _Tx(self._conn)
+
+class _Tx:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
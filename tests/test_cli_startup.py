@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# In-process import time of the CLI module: 85-95ms when httpx/yaml/dotenv were
+# imported eagerly, well under 5ms now. The budget sits far below the eager cost
+# so a regression fails, with headroom for slow CI.
+IMPORT_BUDGET_S = 0.02
+HEAVY_MODULES = ("httpx", "yaml", "dotenv", "sqlite3", "llm_guardrails_audit.azure_client")
+
+def _run(code, cwd, **env):
+    # Minimal env and a neutral cwd: no developer AUDIT_* vars or .env leak in.
+    base = {k: os.environ[k] for k in ("PATH", "PYTHONPATH", "SYSTEMROOT") if k in os.environ}
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd, env={**base, **env}, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def test_cli_import_is_light_and_within_budget(tmp_path):
+    res = _run(
+        "import json, sys, time\n"
+        "t = time.perf_counter()\n"
+        "import llm_guardrails_audit.cli\n"
+        "dt = time.perf_counter() - t\n"
+        f"print(json.dumps({{'dt': dt, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n",
+        cwd=str(tmp_path),
+    )
+    assert res["loaded"] == []
+    assert res["dt"] < IMPORT_BUDGET_S
+
+def test_plan_does_not_load_network_stack(tmp_path):
+    res = _run(
+        "import json, sys\n"
+        "from llm_guardrails_audit.cli import main\n"
+        "rc = main(['plan'])\n"
+        "print(json.dumps({'rc': rc, 'httpx': 'httpx' in sys.modules, "
+        "'client': 'llm_guardrails_audit.azure_client' in sys.modules}))\n",
+        cwd=str(tmp_path),
+        AUDIT_PACK=os.path.join(ROOT, "packs", "core_pack.yaml"),
+        AUDIT_RUNCFG=os.path.join(ROOT, "configs", "run.defaults.yaml"),
+        AUDIT_PLACEHOLDERS=os.path.join(ROOT, "packs", "placeholders.example.yaml"),
+    )
+    assert res == {"rc": 0, "httpx": False, "client": False}
@@ -0,0 +1,116 @@
+from llm_guardrails_audit.models import Case, RequestParams, ObservedResponse, FilterSignals
+from llm_guardrails_audit.params import params_fingerprint
+from llm_guardrails_audit.work_queue import SqliteWorkQueue, WorkItem
+from llm_guardrails_audit.distributed import enqueue_cases, merge_results, run_worker
+from llm_guardrails_audit.report import build_report, sha256_text
+
+def _item(case_id, target="dep", params=None):
+    p = RequestParams()
+    return WorkItem(case_id, target, "p", params or {}, params_fingerprint(p))
+
+def test_lease_is_exclusive_until_expiry(tmp_path):
+    q = SqliteWorkQueue(str(tmp_path / "q.sqlite"))
+    q.enqueue("r1", [_item("A"), _item("B")])
+    [a] = q.lease("w1", lease_s=60)
+    assert a.case_id == "A" and a.run_id == "r1"
+
+    # expired lease (dead worker) is handed out again
+    [b] = q.lease("w1", lease_s=-1)
+    [b2] = q.lease("w2", lease_s=60)
+    assert b2.case_id == "B" and b2.attempts == 2
+    assert q.lease("w3", lease_s=60) == []
+
+def test_first_result_wins_and_target_filter(tmp_path):
+    q = SqliteWorkQueue(str(tmp_path / "q.sqlite"))
+    q.enqueue("r1", [_item("A", target="other")])
+    assert q.lease("w1", target="dep") == []
+    q.lease("w1", target="other")
+    assert q.complete("r1", "A", "w1", {"v": 1}) is True
+    assert q.complete("r1", "A", "w2", {"v": 2}) is False
+    assert q.results() == {"A": {"v": 1}}
+    assert q.pending() == 0
+
+def test_new_run_replaces_previous_run(tmp_path):
+    q = SqliteWorkQueue(str(tmp_path / "q.sqlite"))
+    q.enqueue("r1", [_item("OLD", target="gone")])
+    q.lease("w1", target="gone")
+    q.enqueue("r2", [_item("NEW")])
+    assert q.pending() == 1
+    assert [it.case_id for it in q.lease("w1", lease_s=60)] == ["NEW"]
+    assert q.lease("w2", target="gone") == []
+    assert q.complete("r1", "OLD", "w1", {"v": 0}) is False
+    assert q.complete("r2", "NEW", "w1", {"v": 1}) is True
+    assert q.results() == {"NEW": {"v": 1}}
+
+def test_queue_creates_missing_parent_dir(tmp_path):
+    q = SqliteWorkQueue(str(tmp_path / "reports" / "nested" / "q.sqlite"))
+    assert q.open_run() is None
+    assert (tmp_path / "reports" / "nested" / "q.sqlite").exists()
+
+def test_closed_run_is_not_leased(tmp_path):
+    q = SqliteWorkQueue(str(tmp_path / "q.sqlite"))
+    assert q.open_run() is None
+    q.enqueue("r1", [_item("A")])
+    q.close_run("r1")
+    assert q.open_run() is None
+    assert q.lease("w1") == []
+
+def test_item_abandoned_after_max_attempts(tmp_path):
+    q = SqliteWorkQueue(str(tmp_path / "q.sqlite"), max_attempts=2)
+    q.enqueue("r1", [_item("A")])
+    q.lease("w1", lease_s=-1)
+    q.lease("w2", lease_s=-1)
+    assert q.pending() == 0
+    assert q.lease("w3") == []
+    assert q.results() == {}
+
+class _FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def chat_completions(self, prompt, params):
+        self.calls.append((prompt, params.max_output_tokens))
+        return ObservedResponse(200, "hello", "stop", None, FilterSignals(finish_reason="stop"))
+
+def test_worker_without_published_run_waits_then_gives_up(tmp_path):
+    q = SqliteWorkQueue(str(tmp_path / "q.sqlite"))
+    assert run_worker(q, _FakeClient(), "w1", poll_s=0, wait_s=0) == 0
+
+def test_worker_reports_unknown_params_instead_of_crashing(tmp_path):
+    q = SqliteWorkQueue(str(tmp_path / "q.sqlite"))
+    q.enqueue("r1", [_item("A", params={"future_key": 1})])
+    client = _FakeClient()
+    assert run_worker(q, client, "w1", poll_s=0) == 1
+    assert client.calls == []
+
+    [r] = merge_results([Case("A", "hate", "output", "en", "p")], RequestParams(), {}, q.results())
+    assert r.classification.guardrail_status == "INCONCLUSIVE"
+    assert r.classification.evidence_codes == ["TEST_NOT_EXECUTED_WORKER_REJECTED"]
+    assert "future_key" in r.observed.error
+
+def test_coordinator_worker_round_trip(tmp_path):
+    q = SqliteWorkQueue(str(tmp_path / "q.sqlite"))
+    cases = [
+        Case("IN", "hate", "input", "en", "say {{X}}", params=RequestParams(max_output_tokens=8)),
+        Case("OUT", "hate", "output", "en", "say hi"),
+        Case("MISS", "hate", "output", "en", "{{MISSING}}"),
+    ]
+    items, local = enqueue_cases(q, cases, RequestParams(), {"X": "hi"}, target="dep", run_id="r1")
+    assert [it.case_id for it in items] == ["IN", "OUT"]
+    assert list(local) == ["MISS"]
+
+    client = _FakeClient()
+    assert run_worker(q, client, "w1", target="dep", poll_s=0) == 2
+    assert sorted(client.calls) == [("say hi", 8), ("say hi", 200)]
+
+    results = merge_results(cases, RequestParams(), local, q.results())
+    assert [r.case.case_id for r in results] == ["IN", "OUT", "MISS"]
+    report = build_report({"deployment": "dep"}, results)
+    assert report["cases"][0]["content_hash"] == sha256_text("hello")
+    assert report["cases"][2]["classification"]["evidence_codes"] == ["TEST_NOT_EXECUTED_MISSING_PLACEHOLDERS"]
+
+def test_missing_worker_result_is_inconclusive():
+    cases = [Case("A", "hate", "output", "en", "p")]
+    [r] = merge_results(cases, RequestParams(), {}, {})
+    assert r.classification.guardrail_status == "INCONCLUSIVE"
+    assert r.classification.evidence_codes == ["TEST_NOT_EXECUTED_NO_WORKER_RESULT"]
@@ -0,0 +1,105 @@
+import pytest
+from llm_guardrails_audit.models import Case, RequestParams
+from llm_guardrails_audit.params import resolve_params, estimate_prompt_tokens
+from llm_guardrails_audit.pack_loader import load_pack
+from llm_guardrails_audit.runner import run_cases
+
+PACK = """
+defaults:
+  request:
+    max_output_tokens: 200
+    timeout_s: 10
+  channels:
+    input:
+      request:
+        max_output_tokens: 8
+cases:
+  - {case_id: IN_01, risk: hate, channel: input, prompt: "a"}
+  - {case_id: OUT_01, risk: hate, channel: output, prompt: "b"}
+  - {case_id: IN_02, risk: hate, channel: input, prompt: "c", request: {max_output_tokens: 4}}
+"""
+
+def test_resolve_params_layers_later_wins():
+    p = resolve_params({"max_output_tokens": 100, "retries": 5}, None, {"max_output_tokens": 1})
+    assert p.max_output_tokens == 1
+    assert p.retries == 5
+    assert p.temperature == RequestParams().temperature
+
+def test_resolve_params_rejects_unknown_key():
+    with pytest.raises(ValueError):
+        resolve_params({"max_tokens": 1})
+
+@pytest.mark.parametrize("layer", [
+    {"oversized_prompt": "SKIP"},
+    {"max_output_tokens": "lots"},
+    {"retries": True},
+    {"timeout_s": 1.5},
+    {"retries": -1},
+    {"max_output_tokens": 0},
+    {"timeout_s": -5},
+    {"timeout_s": 0},
+    {"retry_backoff_s": -0.5},
+    {"max_prompt_tokens": -1},
+    {"temperature": 2.5},
+    {"top_p": 1.1},
+])
+def test_resolve_params_rejects_bad_values(layer):
+    with pytest.raises(ValueError, match="case.yaml"):
+        resolve_params(layer, where="case.yaml")
+
+def test_resolve_params_coerces_numbers():
+    p = resolve_params({"max_output_tokens": "16", "temperature": 1, "max_prompt_tokens": None})
+    assert p.max_output_tokens == 16 and isinstance(p.temperature, float)
+    assert p.max_prompt_tokens is None
+
+def test_params_are_hashable():
+    assert hash(resolve_params({"top_p": 0.5})) == hash(RequestParams(top_p=0.5))
+
+def test_load_pack_resolves_per_case(tmp_path):
+    path = tmp_path / "pack.yaml"
+    path.write_text(PACK, encoding="utf-8")
+    cases = {c.case_id: c for c in load_pack(str(path), base_request={"timeout_s": 60, "retries": 0})}
+    assert cases["IN_01"].params.max_output_tokens == 8
+    assert cases["OUT_01"].params.max_output_tokens == 200
+    assert cases["IN_02"].params.max_output_tokens == 4
+    assert cases["OUT_01"].params.timeout_s == 10
+    assert cases["OUT_01"].params.retries == 0
+
+def test_load_pack_rejects_unknown_channel(tmp_path):
+    path = tmp_path / "pack.yaml"
+    path.write_text(PACK.replace("    input:\n", "    inptu:\n"), encoding="utf-8")
+    with pytest.raises(ValueError, match="inptu"):
+        load_pack(str(path))
+
+def test_load_pack_rejects_unknown_case_channel(tmp_path):
+    path = tmp_path / "pack.yaml"
+    path.write_text(PACK.replace("case_id: OUT_01, risk: hate, channel: output", "case_id: OUT_01, risk: hate, channel: inptu"), encoding="utf-8")
+    with pytest.raises(ValueError, match=r"cases\[OUT_01\].*inptu"):
+        load_pack(str(path))
+
+@pytest.mark.parametrize("old, new, label", [
+    ("    timeout_s: 10\n", "    max_tokens: 10\n", r"defaults\.request:"),
+    ("        max_output_tokens: 8\n", "        max_output_tokens: 0\n", r"defaults\.channels\.input\.request:"),
+    ("request: {max_output_tokens: 4}", "request: {retries: -1}", r"cases\[IN_02\]\.request:"),
+])
+def test_load_pack_errors_name_the_layer(tmp_path, old, new, label):
+    path = tmp_path / "pack.yaml"
+    path.write_text(PACK.replace(old, new), encoding="utf-8")
+    with pytest.raises(ValueError, match=label):
+        load_pack(str(path))
+
+def test_estimate_prompt_tokens():
+    assert estimate_prompt_tokens("") == 0
+    assert estimate_prompt_tokens("hello, world") >= 3
+    assert estimate_prompt_tokens("x" * 400) == 100
+
+class _NoCallClient:
+    def chat_completions(self, prompt, params):
+        raise AssertionError("should not be called")
+
+def test_oversized_prompt_skipped():
+    params = RequestParams(max_prompt_tokens=5, oversized_prompt="skip")
+    c = Case("X", "hate", "input", "en", "word " * 50, params=params)
+    [r] = run_cases(_NoCallClient(), [c], RequestParams(), {})
+    assert r.classification.evidence_codes == ["TEST_NOT_EXECUTED_PROMPT_TOO_LARGE"]
+    assert r.params is params
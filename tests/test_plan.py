@@ -0,0 +1,43 @@
+import os
+from llm_guardrails_audit.models import Case, RequestParams
+from llm_guardrails_audit.plan import plan_cases
+from llm_guardrails_audit.runner import render_case
+from llm_guardrails_audit.cli import _plan_main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACK = os.path.join(ROOT, "packs", "core_pack.yaml")
+RUNCFG = os.path.join(ROOT, "configs", "run.defaults.yaml")
+PLACEHOLDERS = os.path.join(ROOT, "packs", "placeholders.example.yaml")
+
+def test_plan_agrees_with_run_skip_rules():
+    big = RequestParams(max_prompt_tokens=5, oversized_prompt="skip")
+    warn = RequestParams(max_prompt_tokens=5)
+    cases = [
+        Case("OK", "hate", "input", "en", "hi"),
+        Case("MISS", "hate", "input", "en", "{{NOPE}}"),
+        Case("BIG", "hate", "input", "en", "word " * 50, params=big),
+        Case("WARN", "hate", "input", "en", "word " * 50, params=warn),
+    ]
+    plan = plan_cases(cases, RequestParams(), {})
+    runnable = [c.case_id for c in cases if render_case(c, RequestParams(), {})[2] is None]
+    assert plan.executable == runnable == ["OK", "WARN"]
+    assert plan.missing_placeholders == {"MISS": ["NOPE"]}
+    assert plan.oversized_skipped == ["BIG"]
+    assert plan.oversized_warned == ["WARN"]
+
+def test_validate_ok_when_all_placeholders_present(capsys):
+    assert _plan_main(PACK, PLACEHOLDERS, RUNCFG, strict=True) == 0
+
+def test_validate_fails_on_missing_placeholders(tmp_path, capsys):
+    missing = str(tmp_path / "none.yaml")
+    assert _plan_main(PACK, missing, RUNCFG, strict=True) == 1
+    # plan only reports them
+    assert _plan_main(PACK, missing, RUNCFG, strict=False) == 0
+    assert "missing in HATE_IN_CANARY_EN_01" in capsys.readouterr().out
+
+def test_validate_and_plan_fail_on_invalid_pack(tmp_path, capsys):
+    pack = tmp_path / "pack.yaml"
+    pack.write_text("cases:\n  - {case_id: A, risk: hate, channel: inptu, prompt: p}\n", encoding="utf-8")
+    assert _plan_main(str(pack), PLACEHOLDERS, RUNCFG, strict=True) == 1
+    assert _plan_main(str(pack), PLACEHOLDERS, RUNCFG, strict=False) == 1
+    assert "inptu" in capsys.readouterr().err